@@ -1,17 +1,13 @@
 import psycopg2
+from database import psycopg2_connect_args
 import time
 
 
 def fix_collation_mismatch():
     try:
         # اتصال به دیتابیس
-        conn = psycopg2.connect(
-            dbname='mydatabase',
-            user='myuser',  # باید superuser باشه
-            password='mypassword',
-            host='localhost',
-            port=5432
-        )
+        # باید superuser باشه
+        conn = psycopg2.connect(**psycopg2_connect_args())
         conn.autocommit = True
         cursor = conn.cursor()
 
@@ -0,0 +1,233 @@
+from sqlalchemy import select
+from collections import OrderedDict, deque, namedtuple
+from database import percentile, psycopg2_connect_args
+import threading
+import selectors
+import time
+import psycopg2
+
+# instance: detached ORM object, version: its updated_at, loaded_at: time.monotonic() of the fetch
+CacheEntry = namedtuple('CacheEntry', ['instance', 'version', 'loaded_at'])
+
+# Latest lookup timings kept for percentiles
+LATENCY_WINDOW = 10000
+
+# NOTIFY payload that invalidates every entry (sent for bulk changes)
+INVALIDATE_ALL = '*'
+
+class EntityCache:
+    """Bounded LRU/TTL read-through cache of ORM objects keyed by primary key
+
+    Misses are loaded in one query per call and kept as detached objects, so
+    JSONB and ARRAY columns are decoded once. Treat them as read-only and
+    don't touch lazy relationships on them.
+
+    Entries expire after ttl_seconds. Changes are picked up sooner in either
+    of two ways. With validate=True, every lookup first compares the cached
+    version_column (updated_at) values in one narrow query. With
+    start_listener(), entries are dropped when NOTIFY messages arrive from
+    the table's change trigger (a key per message, or '*' for everything);
+    that also catches raw SQL updates that don't bump updated_at.
+    """
+
+    def __init__(self, session_factory, model, max_size=10000, ttl_seconds=300,
+                 validate=False, version_column='updated_at'):
+        self.session_factory = session_factory
+        self.model = model
+        self.key = next(iter(model.__table__.primary_key))
+        self.version = getattr(model, version_column)
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.validate = validate
+        self.entries = OrderedDict()
+        # key -> [loads in flight, invalidation generation]; a load only stores its
+        # result if no invalidation arrived while it was running
+        self.pending = {}
+        self.all_generation = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lookup_seconds = deque(maxlen=LATENCY_WINDOW)
+        self.load_seconds = deque(maxlen=LATENCY_WINDOW)
+
+    def get(self, key):
+        """One object by primary key, or None when it doesn't exist"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """{key: object} for the keys that exist, querying only the ones not cached"""
+        start = time.perf_counter()
+        keys = list(dict.fromkeys(keys))
+        now = time.monotonic()
+        found, missing = {}, []
+        with self.lock:
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is not None and now - entry.loaded_at < self.ttl_seconds:
+                    self.entries.move_to_end(key)
+                    found[key] = entry
+                else:
+                    missing.append(key)
+
+        session = self.session_factory()
+        generations = {}
+        try:
+            if self.validate and found:
+                versions = dict(session.execute(
+                    select(self.key, self.version).where(self.key.in_(list(found)))
+                ).all())
+                changed = [key for key, entry in found.items() if versions.get(key) != entry.version]
+                for key in changed:
+                    del found[key]
+                missing.extend(changed)
+                with self.lock:
+                    self.stale += len(changed)
+            if missing:
+                generations = self.begin_load(missing)
+            loaded = self.load(session, missing) if missing else {}
+        except BaseException:
+            with self.lock:
+                self.end_load(generations)
+            raise
+        finally:
+            session.close()
+
+        with self.lock:
+            self.hits += len(found)
+            self.misses += len(missing)
+            for key, instance in loaded.items():
+                if self.unchanged_since(key, generations):
+                    self.store(key, instance)
+            self.end_load(generations)
+            self.lookup_seconds.append(time.perf_counter() - start)
+
+        result = {key: entry.instance for key, entry in found.items()}
+        result.update(loaded)
+        return {key: result[key] for key in keys if key in result}
+
+    def begin_load(self, keys):
+        """Register loads in flight; returns the generations to compare against after loading"""
+        with self.lock:
+            generations = {None: self.all_generation}
+            for key in keys:
+                pending = self.pending.setdefault(key, [0, 0])
+                pending[0] += 1
+                generations[key] = pending[1]
+            return generations
+
+    def unchanged_since(self, key, generations):
+        """No invalidation of key (or of everything) since begin_load; the caller holds self.lock"""
+        return (self.all_generation == generations[None]
+                and self.pending[key][1] == generations[key])
+
+    def end_load(self, generations):
+        """Unregister loads in flight; the caller holds self.lock"""
+        for key in generations:
+            if key is None:
+                continue
+            pending = self.pending[key]
+            pending[0] -= 1
+            if pending[0] == 0:
+                del self.pending[key]
+
+    def load(self, session, keys):
+        start = time.perf_counter()
+        instances = session.execute(select(self.model).where(self.key.in_(keys))).scalars().all()
+        session.expunge_all()
+        with self.lock:
+            self.load_seconds.append(time.perf_counter() - start)
+        return {getattr(instance, self.key.key): instance for instance in instances}
+
+    def store(self, key, instance):
+        """Insert or refresh an entry; the caller holds self.lock"""
+        self.entries[key] = CacheEntry(instance, getattr(instance, self.version.key), time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        with self.lock:
+            if key in self.pending:
+                self.pending[key][1] += 1
+            if self.entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.all_generation += 1
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+
+    def start_listener(self, channel, poll_seconds=1.0):
+        """LISTEN on channel in a daemon thread and drop the entries named in payloads
+
+        Uses its own connection to the database the session factory is bound
+        to (not one from the pool) since it is held for the lifetime of the
+        listener. Set the returned event to stop it.
+        """
+        session = self.session_factory()
+        try:
+            url = session.get_bind(self.model).url
+        finally:
+            session.close()
+        connection = psycopg2.connect(**psycopg2_connect_args(url))
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {channel}")
+        key_type = self.key.type.python_type
+        selector = selectors.DefaultSelector()
+        selector.register(connection, selectors.EVENT_READ)
+        stop = threading.Event()
+
+        def run():
+            try:
+                while not stop.is_set():
+                    if not selector.select(poll_seconds):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        payload = connection.notifies.pop(0).payload
+                        if payload == INVALIDATE_ALL:
+                            self.clear()
+                        else:
+                            self.invalidate(key_type(payload))
+            finally:
+                selector.close()
+                connection.close()
+
+        threading.Thread(target=run, name=f'{channel}-listener', daemon=True).start()
+        return stop
+
+    def statistics(self):
+        """Snapshot of hit ratio, entry counts and latencies as a dict"""
+        with self.lock:
+            lookups = list(self.lookup_seconds)
+            loads = list(self.load_seconds)
+            requested = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / requested if requested else 0.0,
+                'stale': self.stale,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'lookup_ms_p50': percentile(lookups, 0.5) * 1000,
+                'lookup_ms_p95': percentile(lookups, 0.95) * 1000,
+                'load_ms_p50': percentile(loads, 0.5) * 1000,
+                'load_ms_p95': percentile(loads, 0.95) * 1000,
+            }
+
+    def print_report(self):
+        stats = self.statistics()
+        print(f"\n=== {self.model.__tablename__.upper()} CACHE ===")
+        print(f"Entries: {stats['entries']:,}/{self.max_size:,}, hit ratio: {stats['hit_ratio']:.1%} "
+              f"({stats['hits']:,} hits, {stats['misses']:,} misses)")
+        print(f"Stale on validation: {stats['stale']:,}, invalidated by NOTIFY: {stats['invalidations']:,}, "
+              f"evicted: {stats['evictions']:,}")
+        print(f"Lookup latency: p50 {stats['lookup_ms_p50']:.3f} ms, p95 {stats['lookup_ms_p95']:.3f} ms")
+        print(f"Database loads: p50 {stats['load_ms_p50']:.3f} ms, p95 {stats['load_ms_p95']:.3f} ms")
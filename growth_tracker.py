@@ -0,0 +1,268 @@
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, DateTime, Float,
+    Index, text, select
+)
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+from collections import defaultdict
+from database import get_engine
+from datetime import datetime, timedelta
+import threading
+import math
+import sys
+
+Base = declarative_base()
+
+# Fixed on-page overheads used by the bloat estimate (bytes)
+PAGE_HEADER = 24
+HEAP_TUPLE_HEADER = 24
+INDEX_TUPLE_HEADER = 8
+LINE_POINTER = 4
+BTREE_SPECIAL = 16
+ALIGNMENT = 8
+
+RELATION_SQL = """
+    SELECT c.oid::regclass::text AS relation,
+           CASE WHEN c.relkind = 'i' THEN 'index' ELSE 'table' END AS kind,
+           coalesce(i.indrelid::regclass::text, c.oid::regclass::text) AS parent,
+           coalesce(am.amname, 'heap') AS method,
+           pg_relation_size(c.oid) AS size_bytes,
+           greatest(c.reltuples, 0) AS reltuples,
+           coalesce((SELECT option_value::int FROM pg_options_to_table(c.reloptions)
+                     WHERE option_name = 'fillfactor'),
+                    CASE WHEN c.relkind = 'i' THEN 90 ELSE 100 END) AS fillfactor
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_index i ON i.indexrelid = c.oid
+    LEFT JOIN pg_am am ON am.oid = c.relam AND c.relkind = 'i'
+    WHERE c.relkind IN ('r', 'm', 'i')
+      AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+      AND n.nspname NOT LIKE 'pg_toast%'
+"""
+
+# Average stored width per relation: table rows, or index keys (expression keys
+# are looked up in the statistics ANALYZE keeps for expression indexes)
+WIDTH_SQL = """
+    SELECT c.oid::regclass::text AS relation,
+           sum(coalesce(st.avg_width, si.avg_width, 8) * (1 - coalesce(st.null_frac, si.null_frac, 0))) AS width
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_index i ON i.indexrelid = c.oid
+    LEFT JOIN pg_class t ON t.oid = i.indrelid
+    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    LEFT JOIN pg_stats st ON st.schemaname = n.nspname
+                         AND st.tablename = coalesce(t.relname, c.relname)
+                         AND st.attname = a.attname
+    LEFT JOIN pg_stats si ON si.schemaname = n.nspname AND si.tablename = c.relname AND si.attname = a.attname
+    WHERE c.relkind IN ('r', 'm', 'i')
+      AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+      AND n.nspname NOT LIKE 'pg_toast%'
+    GROUP BY c.oid
+"""
+
+class RelationSizeSample(Base):
+    """One size/bloat sample of a table or index"""
+    __tablename__ = 'relation_size_history'
+    __table_args__ = (
+        Index('idx_relation_size_history_relation_sampled', 'relation', 'sampled_at'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    sampled_at = Column(DateTime, nullable=False)
+    relation = Column(String(255), nullable=False)
+    kind = Column(String(10), nullable=False)
+    parent = Column(String(255), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    estimated_bloat_bytes = Column(BigInteger)
+    row_estimate = Column(Float)
+
+def connect_to_database():
+    """Connect to PostgreSQL database"""
+    try:
+        return get_engine()
+    except SQLAlchemyError as e:
+        print(f"Error connecting to database: {e}")
+        sys.exit(1)
+
+def align(size):
+    return int(math.ceil(size / ALIGNMENT) * ALIGNMENT)
+
+def estimate_bloat(relation, width, block_size):
+    """Estimated bloat in bytes from reltuples and pg_stats widths
+
+    Heap tables and B-tree indexes only; other access methods return None.
+    The expected size is the number of pages the live rows need at the
+    relation's fillfactor; anything beyond that is counted as bloat.
+    """
+    if width is None or relation['reltuples'] == 0:
+        return None
+    if relation['method'] == 'heap':
+        entry = align(HEAP_TUPLE_HEADER + width) + LINE_POINTER
+        usable = (block_size - PAGE_HEADER) * relation['fillfactor'] / 100
+        overhead_pages = 0
+    elif relation['method'] == 'btree':
+        entry = align(INDEX_TUPLE_HEADER + width) + LINE_POINTER
+        usable = (block_size - PAGE_HEADER - BTREE_SPECIAL) * relation['fillfactor'] / 100
+        overhead_pages = 1  # metapage
+    else:
+        return None
+    expected_pages = math.ceil(relation['reltuples'] * entry / usable) + overhead_pages
+    return max(0, relation['size_bytes'] - expected_pages * block_size)
+
+def collect_sample(engine):
+    """Sample every table and index into relation_size_history and return the rows"""
+    sampled_at = datetime.now()
+    with engine.connect() as conn:
+        block_size = int(conn.execute(text("SHOW block_size")).scalar())
+        widths = {relation: float(width) for relation, width in conn.execute(text(WIDTH_SQL))}
+        relations = [dict(row._mapping) for row in conn.execute(text(RELATION_SQL))]
+
+    samples = [
+        RelationSizeSample(
+            sampled_at=sampled_at,
+            relation=relation['relation'],
+            kind=relation['kind'],
+            parent=relation['parent'],
+            size_bytes=relation['size_bytes'],
+            estimated_bloat_bytes=estimate_bloat(relation, widths.get(relation['relation']), block_size),
+            row_estimate=relation['reltuples'],
+        )
+        for relation in relations
+    ]
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        session.add_all(samples)
+        session.commit()
+    finally:
+        session.close()
+    return samples
+
+def start_collector(engine, interval_seconds=3600):
+    """Sample on a schedule in a daemon thread; set the returned event to stop it"""
+    Base.metadata.create_all(engine)
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            try:
+                collect_sample(engine)
+            except SQLAlchemyError as e:
+                print(f"Error collecting relation sizes: {e}")
+            stop.wait(interval_seconds)
+
+    threading.Thread(target=run, name='relation-size-collector', daemon=True).start()
+    return stop
+
+def slope_per_day(points):
+    """Least-squares slope of (datetime, value) points in units per day"""
+    if len(points) < 2:
+        return 0.0
+    origin = points[0][0]
+    xs = [(sampled_at - origin).total_seconds() / 86400 for sampled_at, _ in points]
+    ys = [value for _, value in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+def growth_report(engine, window_days=30, horizon_days=30, bloat_threshold=0.3):
+    """Growth rate and projected bloat per relation over the sampling window
+
+    Returns dicts sorted by projected bloat ratio. days_to_threshold tells how
+    long until bloat_threshold is crossed at the current rate (0 when already
+    past it, None when bloat isn't growing or can't be estimated).
+    """
+    since = datetime.now() - timedelta(days=window_days)
+    session = sessionmaker(bind=engine)()
+    try:
+        rows = session.execute(
+            select(RelationSizeSample)
+            .where(RelationSizeSample.sampled_at >= since)
+            .order_by(RelationSizeSample.relation, RelationSizeSample.sampled_at)
+        ).scalars().all()
+    finally:
+        session.close()
+
+    history = defaultdict(list)
+    for row in rows:
+        history[row.relation].append(row)
+
+    report = []
+    for relation, samples in history.items():
+        latest = samples[-1]
+        size_rate = slope_per_day([(s.sampled_at, s.size_bytes) for s in samples])
+        bloat_points = [(s.sampled_at, s.estimated_bloat_bytes) for s in samples if s.estimated_bloat_bytes is not None]
+        bloat_rate = slope_per_day(bloat_points)
+        bloat = latest.estimated_bloat_bytes
+        projected_size = latest.size_bytes + size_rate * horizon_days
+        projected_bloat = None if bloat is None else max(0.0, bloat + bloat_rate * horizon_days)
+        projected_ratio = projected_bloat / projected_size if projected_bloat is not None and projected_size > 0 else None
+
+        days_to_threshold = None
+        if bloat is not None and latest.size_bytes > 0:
+            if bloat / latest.size_bytes >= bloat_threshold:
+                days_to_threshold = 0
+            elif bloat_rate > bloat_threshold * size_rate:
+                # bloat + b*t = threshold * (size + s*t)
+                days_to_threshold = (bloat_threshold * latest.size_bytes - bloat) / (bloat_rate - bloat_threshold * size_rate)
+
+        report.append({
+            'relation': relation,
+            'kind': latest.kind,
+            'parent': latest.parent,
+            'size_bytes': latest.size_bytes,
+            'size_bytes_per_day': size_rate,
+            'bloat_bytes': bloat,
+            'bloat_ratio': None if bloat is None or latest.size_bytes == 0 else bloat / latest.size_bytes,
+            'projected_bloat_ratio': projected_ratio,
+            'days_to_threshold': days_to_threshold,
+        })
+    return sorted(report, key=lambda entry: -(entry['projected_bloat_ratio'] or 0))
+
+def show_growth_report(report, bloat_threshold=0.3, horizon_days=30):
+    print(f"\n{'='*96}")
+    print("RELATION GROWTH AND BLOAT")
+    print(f"{'='*96}")
+    print(f"{'Relation':<40} {'Kind':<6} {'Size MB':>9} {'MB/day':>8} {'Bloat':>7} "
+          f"{f'In {horizon_days}d':>7} {'Reindex in':>12}")
+    print("-" * 96)
+    for entry in report:
+        bloat = '-' if entry['bloat_ratio'] is None else f"{entry['bloat_ratio']:.0%}"
+        projected = '-' if entry['projected_bloat_ratio'] is None else f"{entry['projected_bloat_ratio']:.0%}"
+        if entry['days_to_threshold'] is None:
+            due = '-'
+        elif entry['days_to_threshold'] == 0:
+            due = 'now'
+        else:
+            due = f"{entry['days_to_threshold']:.0f} days"
+        print(f"{entry['relation']:<40} {entry['kind']:<6} {entry['size_bytes'] / 1024 / 1024:>9.1f} "
+              f"{entry['size_bytes_per_day'] / 1024 / 1024:>8.2f} {bloat:>7} {projected:>7} {due:>12}")
+    print(f"\nReindex is due when estimated bloat reaches {bloat_threshold:.0%} of the relation size.")
+    print("Estimates rely on reltuples and pg_stats, so run ANALYZE before sampling for best accuracy.")
+
+def main():
+    """Take a size sample now (or every N seconds with --every N) and print the growth report"""
+    print("📈 PostgreSQL Relation Growth Tracker")
+    print("=" * 80)
+
+    engine = connect_to_database()
+    Base.metadata.create_all(engine)
+
+    if len(sys.argv) > 2 and sys.argv[1] == '--every':
+        interval = int(sys.argv[2])
+        stop = start_collector(engine, interval)
+        print(f"Sampling every {interval}s, press Ctrl+C to stop and print the report.")
+        try:
+            while not stop.wait(interval):
+                show_growth_report(growth_report(engine))
+        except KeyboardInterrupt:
+            stop.set()
+    else:
+        samples = collect_sample(engine)
+        print(f"Recorded {len(samples)} relation samples.")
+
+    show_growth_report(growth_report(engine))
+
+if __name__ == "__main__":
+    main()
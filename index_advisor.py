@@ -0,0 +1,214 @@
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from collections import defaultdict
+from database import get_engine
+import sys
+
+INDEX_CATALOG_SQL = """
+    SELECT i.indexrelid::regclass::text AS index_name,
+           i.indrelid::regclass::text AS table_name,
+           am.amname AS method,
+           i.indisunique AS is_unique,
+           i.indisprimary AS is_primary,
+           EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid) AS backs_constraint,
+           i.indkey::text AS keys,
+           i.indclass::text AS opclasses,
+           coalesce(pg_get_expr(i.indexprs, i.indrelid), '') AS expressions,
+           coalesce(pg_get_expr(i.indpred, i.indrelid), '') AS predicate,
+           pg_get_indexdef(i.indexrelid) AS definition,
+           pg_relation_size(i.indexrelid) AS size_bytes,
+           coalesce(s.idx_scan, 0) AS scans,
+           coalesce(t.n_tup_ins, 0) + coalesce(t.n_tup_upd, 0) - coalesce(t.n_tup_hot_upd, 0) AS index_writes
+    FROM pg_index i
+    JOIN pg_class ci ON ci.oid = i.indexrelid
+    JOIN pg_am am ON am.oid = ci.relam
+    JOIN pg_namespace n ON n.oid = ci.relnamespace
+    LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+    LEFT JOIN pg_stat_user_tables t ON t.relid = i.indrelid
+    WHERE n.nspname NOT IN ('pg_catalog', 'information_schema')
+      AND n.nspname NOT LIKE 'pg_toast%'
+      AND i.indisvalid
+    ORDER BY table_name, index_name
+"""
+
+def connect_to_database():
+    """Connect to PostgreSQL database"""
+    try:
+        return get_engine()
+    except SQLAlchemyError as e:
+        print(f"Error connecting to database: {e}")
+        sys.exit(1)
+
+def load_indexes(engine):
+    """Return (index rows as dicts, time of the last statistics reset)"""
+    with engine.connect() as conn:
+        indexes = [dict(row._mapping) for row in conn.execute(text(INDEX_CATALOG_SQL))]
+        stats_reset = conn.execute(text(
+            "SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()"
+        )).scalar()
+    for index in indexes:
+        index['key_list'] = index['keys'].split()
+        index['opclass_list'] = index['opclasses'].split()
+        # Constraint-backing and unique indexes enforce rules and can't simply be dropped
+        index['required'] = index['is_primary'] or index['is_unique'] or index['backs_constraint']
+    return indexes, stats_reset
+
+def is_plain(index):
+    """No expressions or predicate: the index is defined by its key columns alone"""
+    return not index['expressions'] and not index['predicate']
+
+def keep_first(candidates):
+    """Order indexes so the one worth keeping comes first"""
+    return sorted(candidates, key=lambda index: (not index['required'], -index['scans'], index['size_bytes']))
+
+def find_duplicates(indexes):
+    """Identical definitions, plus hash or GIN/GiST pairs that overlap on the same key
+
+    Like the other finders, returns (index, kind, reason, kept index) tuples;
+    the kept index is the one the finding relies on staying in place.
+    """
+    findings = []
+    groups = defaultdict(list)
+    for index in indexes:
+        groups[(index['table_name'], index['method'], index['keys'], index['opclasses'],
+                index['expressions'], index['predicate'])].append(index)
+    for group in groups.values():
+        keep, *drops = keep_first(group)
+        for index in drops:
+            if not index['required']:
+                findings.append((index, 'duplicate', f"same definition as {keep['index_name']}", keep))
+
+    by_key = defaultdict(list)
+    for index in indexes:
+        if is_plain(index):
+            by_key[(index['table_name'], index['key_list'][0] if index['key_list'] else '')].append(index)
+    for group in by_key.values():
+        btrees = [index for index in group if index['method'] == 'btree']
+        for index in group:
+            # A B-tree whose leading column is the hash key serves every equality lookup
+            if index['method'] == 'hash' and btrees and not index['required']:
+                keep = keep_first(btrees)[0]
+                findings.append((index, 'duplicate', f"equality lookups served by {keep['index_name']}", keep))
+        text_search = [index for index in group if index['method'] in ('gin', 'gist') and len(index['key_list']) == 1]
+        if len({index['method'] for index in text_search}) > 1:
+            keep, *drops = keep_first(text_search)
+            for index in drops:
+                if not index['required']:
+                    findings.append((index, 'overlap', f"same key as {keep['index_name']} ({keep['method']})", keep))
+    return findings
+
+def find_prefix_redundant(indexes):
+    """B-tree indexes whose columns and operator classes are a leading prefix of another B-tree
+
+    The widest covering index is named, so a chain (a) < (a, b) < (a, b, c)
+    relies on (a, b, c) alone and both shorter ones can go.
+    """
+    findings = []
+    btrees = [index for index in indexes if index['method'] == 'btree' and is_plain(index)]
+    for index in btrees:
+        if index['required']:
+            continue
+        width = len(index['key_list'])
+        covering = [
+            other for other in btrees
+            if other is not index and other['table_name'] == index['table_name']
+            and len(other['key_list']) > width
+            and other['key_list'][:width] == index['key_list']
+            and other['opclass_list'][:width] == index['opclass_list']
+        ]
+        if covering:
+            other = min(keep_first(covering), key=lambda other: -len(other['key_list']))
+            findings.append((index, 'prefix', f"leading columns of {other['index_name']}", other))
+    return findings
+
+def find_unused(indexes):
+    """Indexes that have not been scanned since the statistics were last reset"""
+    return [
+        (index, 'unused', 'no scans since last stats reset', None)
+        for index in indexes
+        if index['scans'] == 0 and not index['required']
+    ]
+
+def advise(engine):
+    """Collect findings (one per index) and the write amplification they account for
+
+    An index another finding relies on (the kept member of a duplicate or
+    overlap pair, the index covering a prefix) is never flagged itself, and a
+    finding whose kept index is already being dropped is skipped, so the
+    drop script never removes both sides of a pair.
+    """
+    indexes, stats_reset = load_indexes(engine)
+    findings = {}
+    kept = set()
+    for index, kind, reason, keep in find_duplicates(indexes) + find_prefix_redundant(indexes) + find_unused(indexes):
+        name = index['index_name']
+        if name in findings or name in kept:
+            continue
+        if keep is not None:
+            if keep['index_name'] in findings:
+                continue
+            kept.add(keep['index_name'])
+        findings[name] = (index, kind, reason)
+
+    index_count = defaultdict(int)
+    for index in indexes:
+        index_count[index['table_name']] += 1
+    dropped = defaultdict(int)
+    for index, _, _ in findings.values():
+        dropped[index['table_name']] += 1
+    # Every heap write (insert or non-HOT update) also writes one entry per index
+    write_savings = {
+        table_name: count / (1 + index_count[table_name])
+        for table_name, count in dropped.items()
+    }
+    return list(findings.values()), write_savings, stats_reset
+
+def create_statement(definition):
+    """Turn pg_get_indexdef output into a CREATE INDEX CONCURRENTLY statement"""
+    return definition.replace(' INDEX ', ' INDEX CONCURRENTLY ', 1)
+
+def write_scripts(findings, drop_path='drop_redundant_indexes.sql', restore_path='restore_redundant_indexes.sql'):
+    """Write the DROP INDEX CONCURRENTLY script and a matching restore script"""
+    with open(drop_path, 'w') as drop_file, open(restore_path, 'w') as restore_file:
+        drop_file.write("-- Generated by index_advisor.py; run outside a transaction block\n")
+        restore_file.write("-- Recreates the indexes dropped by drop_redundant_indexes.sql\n")
+        for index, kind, reason in findings:
+            drop_file.write(f"-- {kind}: {reason}\nDROP INDEX CONCURRENTLY IF EXISTS {index['index_name']};\n")
+            restore_file.write(f"{create_statement(index['definition'])};\n")
+    print(f"\nScripts written to {drop_path} and {restore_path}")
+
+def show_report(findings, write_savings, stats_reset):
+    print(f"\n{'='*80}")
+    print("REDUNDANT AND UNUSED INDEXES")
+    print(f"{'='*80}")
+    print(f"Statistics collected since: {stats_reset or 'server start'}\n")
+
+    if not findings:
+        print("No redundant or unused indexes found.")
+        return
+
+    total_bytes = 0
+    for index, kind, reason in findings:
+        total_bytes += index['size_bytes']
+        print(f"  • {index['index_name']} on {index['table_name']} [{kind}]")
+        print(f"    {reason}; {index['size_bytes'] / 1024 / 1024:.1f} MB, "
+              f"{index['scans']:,} scans, {index['index_writes']:,} index writes avoidable")
+
+    print(f"\nSpace reclaimed: {total_bytes / 1024 / 1024:.1f} MB")
+    print("Write amplification saved (share of per-row write work):")
+    for table_name, saving in sorted(write_savings.items()):
+        print(f"  • {table_name}: {saving:.0%}")
+
+def main():
+    """Report redundant and unused indexes and write DROP/restore scripts"""
+    print("🔍 PostgreSQL Index Advisor")
+    print("=" * 80)
+
+    engine = connect_to_database()
+    findings, write_savings, stats_reset = advise(engine)
+    show_report(findings, write_savings, stats_reset)
+    if findings:
+        write_scripts(findings)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+from sqlalchemy import MetaData, Table, select, text, or_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, Grouping
+from sqlalchemy.sql.visitors import replacement_traverse
+from sqlalchemy.exc import SQLAlchemyError
+from query_estimates import Explain
+from database import get_engine
+import statistics
+import sys
+
+# Operators that step into a JSONB document: -> / ->> take one key, #> / #>> a path
+KEY_OPERATORS = ('->', '->>')
+PATH_OPERATORS = ('#>', '#>>')
+
+def json_key_path(expression):
+    """Return (jsonb column, [keys]) for expressions like col['a']['b'].astext, else None"""
+    keys = []
+    while True:
+        if isinstance(expression, Grouping):
+            expression = expression.element
+            continue
+        if not isinstance(expression, BinaryExpression) or not isinstance(expression.right, BindParameter):
+            break
+        opstring = getattr(expression.operator, 'opstring', None)
+        value = expression.right.value
+        if expression.operator is operators.json_getitem_op or opstring in KEY_OPERATORS:
+            if not isinstance(value, str):
+                return None  # array subscripts can't be expressed as containment
+            keys.insert(0, value)
+        elif expression.operator is operators.json_path_getitem_op or opstring in PATH_OPERATORS:
+            if not all(isinstance(key, str) for key in value):
+                return None
+            keys[0:0] = list(value)
+        else:
+            return None
+        expression = expression.left
+    if keys and isinstance(getattr(expression, 'type', None), JSONB):
+        return expression, keys
+    return None
+
+def containment(column, keys, value):
+    """column @> {"k1": {"k2": value}}"""
+    document = value
+    for key in reversed(keys):
+        document = {key: document}
+    return column.contains(document)
+
+def rewrite_equality(element):
+    """Containment form of one `json key = value` or `json key IN (...)`, else None"""
+    if not isinstance(element, BinaryExpression) or not isinstance(element.right, BindParameter):
+        return None
+    if element.operator not in (operators.eq, operators.in_op):
+        return None
+    found = json_key_path(element.left)
+    if found is None:
+        return None
+    column, keys = found
+    if element.operator is operators.eq:
+        return containment(column, keys, element.right.value)
+    return or_(*(containment(column, keys, value) for value in element.right.value)).self_group()
+
+def containment_filter(clause):
+    """Rewrite equality and IN filters on JSONB keys into @> containment predicates
+
+    col['department'].astext == 'IT' becomes col @> '{"department": "IT"}' and
+    an IN list becomes an OR of containments, both of which a GIN index
+    (jsonb_ops or jsonb_path_ops) can serve. The JSON type comes from the
+    Python value, so compare strings with .astext and numbers or booleans
+    with .as_integer()/.as_float()/.as_boolean(); other filters are kept.
+    """
+    return replacement_traverse(clause, {}, rewrite_equality)
+
+def jsonb_index_ddl(table_name, column_name, path_ops=True):
+    """CREATE INDEX statement for a GIN index on a JSONB column
+
+    path_ops=True builds the smaller, faster jsonb_path_ops GIN, which supports
+    only @> (and jsonpath) queries; otherwise the default jsonb_ops, which also
+    serves the key-existence operators ?, ?| and ?&.
+    """
+    suffix = 'path_ops' if path_ops else 'gin'
+    opclass = ' jsonb_path_ops' if path_ops else ''
+    name = f"idx_{table_name}_{column_name}_{suffix}"
+    return name, f"CREATE INDEX {name} ON {table_name} USING gin ({column_name}{opclass})"
+
+def expression_index_ddl(table_name, expression, name):
+    """CREATE INDEX statement on a hot-key expression such as col['k'].astext
+
+    The expression is rendered exactly as SQLAlchemy renders it in queries
+    (e.g. CAST(col ->> 'level' AS INTEGER)), so the planner can match it.
+    """
+    rendered = expression.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})
+    return name, f"CREATE INDEX {name} ON {table_name} (({rendered}))"
+
+def column_indexes(conn, table, column):
+    """Names of existing indexes that include the given column"""
+    return conn.execute(text("""
+        SELECT i.indexrelid::regclass::text
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = to_regclass(:table_name) AND a.attname = :column_name
+          AND NOT i.indisprimary AND NOT i.indisunique
+    """), {'table_name': table.name, 'column_name': column.name}).scalars().all()
+
+def benchmark_jsonb_forms(engine, table, column, filters, repeat=5):
+    """Latency of ->> equality vs @> containment under each index option
+
+    filters is a list of (label, clause) using ->> / .astext comparisons.
+    Every variant runs in a transaction that drops the column's existing
+    indexes, builds its own, runs ANALYZE and EXPLAIN ANALYZE, and rolls back.
+    """
+    expression_indexes = [
+        expression_index_ddl(table.name, clause.left, f"idx_{table.name}_{column.name}_hot_{number}")
+        for number, (_, clause) in enumerate(filters, 1)
+    ]
+    variants = [
+        ('->> no index', False, []),
+        ('@> jsonb_ops GIN', True, [jsonb_index_ddl(table.name, column.name, path_ops=False)]),
+        ('@> jsonb_path_ops GIN', True, [jsonb_index_ddl(table.name, column.name)]),
+        ('->> expression B-tree', False, expression_indexes),
+    ]
+    results = []
+    with engine.connect() as conn:
+        for variant, rewrite, ddl in variants:
+            transaction = conn.begin()
+            try:
+                for name in column_indexes(conn, table, column):
+                    conn.execute(text(f"DROP INDEX {name}"))
+                for _, statement in ddl:
+                    conn.execute(text(statement))
+                conn.execute(text(f"ANALYZE {table.name}"))
+                for label, clause in filters:
+                    statement = select(table.c[next(iter(table.primary_key)).name]).where(
+                        containment_filter(clause) if rewrite else clause
+                    )
+                    timings = [
+                        conn.execute(Explain(statement)).scalar()[0]['Execution Time']
+                        for _ in range(repeat)
+                    ]
+                    results.append((table.name, label, variant, statistics.median(timings)))
+            finally:
+                transaction.rollback()
+
+    print(f"\n{'Table':<16} {'Filter':<32} {'Form / index':<24} {'Median ms':>10}")
+    print("-" * 85)
+    for table_name, label, variant, median in results:
+        print(f"{table_name:<16} {label:<32} {variant:<24} {median:>10.3f}")
+    return results
+
+def main():
+    """Benchmark JSONB filter forms on index_demo_orm and products"""
+    try:
+        engine = get_engine()
+    except SQLAlchemyError as e:
+        print(f"Error connecting to database: {e}")
+        sys.exit(1)
+
+    metadata = MetaData()
+    for table_name, filters in [
+        ('index_demo_orm', lambda c: [
+            ("department = 'IT'", c['department'].astext == 'IT'),
+            ("department IN (IT, Finance)", c['department'].astext.in_(['IT', 'Finance'])),
+            ("level = 5", c['level'].as_integer() == 5),
+        ]),
+        ('products', lambda c: [
+            ("warranty_years = 2", c['warranty_years'].as_integer() == 2),
+            ("specifications.ram = '32GB'", c[('specifications', 'ram')].astext == '32GB'),
+        ]),
+    ]:
+        try:
+            table = Table(table_name, metadata, autoload_with=engine)
+        except SQLAlchemyError as e:
+            print(f"Skipping {table_name}: {e}")
+            continue
+        column = table.c.metadata_json
+        benchmark_jsonb_forms(engine, table, column, filters(column))
+
+if __name__ == "__main__":
+    main()
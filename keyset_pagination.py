@@ -0,0 +1,101 @@
+from sqlalchemy import tuple_
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+import base64
+import json
+import uuid
+
+# rows: the page, next_token: continuation token (None on the last page)
+Page = namedtuple('Page', ['rows', 'next_token'])
+
+# How sort key values are written into and read back from a token
+TOKEN_TYPES = {
+    'datetime': (datetime, datetime.isoformat, datetime.fromisoformat),
+    'date': (date, date.isoformat, date.fromisoformat),
+    'decimal': (Decimal, str, Decimal),
+    'uuid': (uuid.UUID, str, uuid.UUID),
+    'bool': (bool, int, lambda value: bool(value)),
+    'int': (int, int, int),
+    'float': (float, float, float),
+    'str': (str, str, str),
+}
+
+def encode_value(value):
+    for name, (kind, dump, _) in TOKEN_TYPES.items():
+        if isinstance(value, kind):
+            return [name, dump(value)]
+    raise TypeError(f"Can't store {type(value).__name__} in a continuation token")
+
+def decode_value(item):
+    name, value = item
+    return TOKEN_TYPES[name][2](value)
+
+class KeysetPaginator:
+    """Cursor pagination that seeks past the last row instead of using OFFSET
+
+    order_by lists the sort columns, ending with a unique one (usually the
+    primary key) so the order is total; they must be NOT NULL and are all
+    sorted in the same direction. Each page filters on
+    (c1, c2, ...) > (last values), which PostgreSQL turns into an index
+    condition when an index has the statement's equality filters followed
+    by the sort columns, so page 10,000 reads as few rows as page 1.
+
+    statement is the filtered Select without ORDER BY or LIMIT. Pass
+    scalars=True for ORM entity selects such as select(Product).
+    """
+
+    def __init__(self, statement, order_by, page_size=20, descending=False, scalars=False):
+        self.statement = statement
+        self.order_by = list(order_by)
+        self.page_size = page_size
+        self.descending = descending
+        self.scalars = scalars
+        # Tokens name the ordering they belong to so they can't be reused elsewhere
+        self.signature = ','.join(column.key for column in self.order_by) + (' desc' if descending else '')
+
+    def encode_token(self, values):
+        payload = json.dumps({'order': self.signature, 'after': [encode_value(value) for value in values]})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_token(self, token):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            values = [decode_value(item) for item in payload['after']]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid continuation token: {e}") from e
+        if payload.get('order') != self.signature or len(values) != len(self.order_by):
+            raise ValueError("Continuation token belongs to a different ordering")
+        return values
+
+    def sort_key(self, row):
+        if self.scalars:
+            return [getattr(row, column.key) for column in self.order_by]
+        return [row._mapping[column.key] for column in self.order_by]
+
+    def page_statement(self, token=None):
+        statement = self.statement
+        if token is not None:
+            key, after = tuple_(*self.order_by), tuple_(*self.decode_token(token))
+            statement = statement.where(key < after if self.descending else key > after)
+        ordering = [column.desc() if self.descending else column.asc() for column in self.order_by]
+        # One extra row tells whether another page follows
+        return statement.order_by(*ordering).limit(self.page_size + 1)
+
+    def page(self, executor, token=None):
+        """Fetch the page after token (the first page when None) with a Session or Connection"""
+        result = executor.execute(self.page_statement(token))
+        rows = result.scalars().all() if self.scalars else result.all()
+        if len(rows) <= self.page_size:
+            return Page(rows, None)
+        rows = rows[:self.page_size]
+        return Page(rows, self.encode_token(self.sort_key(rows[-1])))
+
+    def pages(self, executor, token=None):
+        """Iterate over every page from token onwards"""
+        while True:
+            page = self.page(executor, token)
+            yield page
+            if page.next_token is None:
+                return
+            token = page.next_token
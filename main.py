@@ -1,13 +1,8 @@
 import psycopg2
+from database import psycopg2_connect_args
 
 try:
-    connection = psycopg2.connect(
-        user="myuser",
-        password="mypassword",
-        host="localhost",
-        port="5432",
-        database="mydatabase"
-    )
+    connection = psycopg2.connect(**psycopg2_connect_args())
     cursor = connection.cursor()
     cursor.execute("SELECT version();")
     record = cursor.fetchone()
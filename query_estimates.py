@@ -0,0 +1,148 @@
+from sqlalchemy import select, func, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.util import find_tables
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.ext.compiler import compiles
+from collections import namedtuple
+import threading
+
+# value: row count, exact: True when counted, staleness: share of rows modified
+# since the last ANALYZE (0 when exact, None for planner estimates of filtered
+# queries, which come with no error bound at all)
+CountResult = namedtuple('CountResult', ['value', 'exact', 'staleness'])
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper so statements keep their bind parameter processing"""
+
+    inherit_cache = False
+
+    def __init__(self, statement, options='ANALYZE, BUFFERS, FORMAT JSON'):
+        self.statement = statement
+        self.options = options
+
+@compiles(Explain, 'postgresql')
+def compile_explain(element, compiler, **kw):
+    return f"EXPLAIN ({element.options}) " + compiler.process(element.statement, **kw)
+
+class CountService:
+    """Row counts from planner statistics, with an exact fallback
+
+    Whole tables are estimated from pg_class. The estimate is returned only
+    when it is at least exact_threshold rows and the statistics are fresh
+    enough: the rows modified since the last ANALYZE, relative to the table
+    size, must stay within max_error. Otherwise the service counts exactly
+    and, when refresh_stats is set, runs ANALYZE (which samples a fixed
+    number of rows) in a background thread so later counts can use the
+    estimate.
+
+    Filtered queries are counted exactly. With plan_estimates=True they get
+    the EXPLAIN row estimate instead (staleness None): the planner's
+    selectivity guesses can be off by orders of magnitude however fresh the
+    statistics are, so max_error says nothing about them.
+    """
+
+    def __init__(self, engine, exact_threshold=100000, max_error=0.05, refresh_stats=True,
+                 plan_estimates=False):
+        self.engine = engine
+        self.exact_threshold = exact_threshold
+        self.max_error = max_error
+        self.refresh_stats = refresh_stats
+        self.plan_estimates = plan_estimates
+        self.lock = threading.Lock()
+        self.refreshing = set()  # tables with an ANALYZE in flight
+
+    def quoted_name(self, conn, table_name):
+        """Quote each part of a (schema-qualified) name so mixed-case tables like "Product" resolve"""
+        preparer = conn.dialect.identifier_preparer
+        return '.'.join(preparer.quote(part) for part in table_name.split('.'))
+
+    def table_statistics(self, conn, table_name):
+        """Return (estimated rows, staleness) for one table, or None without statistics"""
+        row = conn.execute(text("""
+            SELECT c.reltuples, c.relpages,
+                   pg_relation_size(c.oid) / current_setting('block_size')::int AS current_pages,
+                   coalesce(s.n_mod_since_analyze, 0), coalesce(s.n_live_tup, 0)
+            FROM pg_class c
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE c.oid = to_regclass(:table_name)
+        """), {'table_name': self.quoted_name(conn, table_name)}).first()
+        if row is None:
+            raise ValueError(f"Unknown table: {table_name}")
+        reltuples, relpages, current_pages, modified, live = row
+        if reltuples < 0 or (relpages == 0 and reltuples == 0 and current_pages > 0):
+            return None  # never analyzed
+        # Same scaling the planner uses: tuple density times the current size
+        estimate = reltuples / relpages * current_pages if relpages > 0 else reltuples
+        return estimate, modified / max(estimate, live, 1)
+
+    def refresh(self, conn, table_names):
+        for table_name in table_names:
+            conn.execute(text(f"ANALYZE {self.quoted_name(conn, table_name)}"))
+        conn.commit()
+
+    def refresh_in_background(self, table_names):
+        """ANALYZE table_names on a separate connection, skipping tables already being analyzed"""
+        with self.lock:
+            pending = [table_name for table_name in table_names if table_name not in self.refreshing]
+            self.refreshing.update(pending)
+        if not pending:
+            return
+
+        def run():
+            try:
+                with self.engine.connect() as conn:
+                    self.refresh(conn, pending)
+            except SQLAlchemyError as e:
+                print(f"Error refreshing statistics for {', '.join(pending)}: {e}")
+            finally:
+                with self.lock:
+                    self.refreshing.difference_update(pending)
+
+        # Not a daemon: a short script waits for ANALYZE at exit instead of aborting it
+        threading.Thread(target=run, name='count-service-analyze').start()
+
+    def exact_count(self, conn, statement, table_name):
+        if statement is None:
+            return conn.execute(text(f"SELECT count(*) FROM {self.quoted_name(conn, table_name)}")).scalar()
+        return conn.execute(select(func.count()).select_from(statement.order_by(None).subquery())).scalar()
+
+    def estimate(self, conn, statement, table_names):
+        """Return (rows, staleness) or None when any table lacks statistics
+
+        rows is None for a filtered statement unless plan_estimates is set.
+        """
+        statistics = [self.table_statistics(conn, table_name) for table_name in table_names]
+        if any(entry is None for entry in statistics):
+            return None
+        staleness = max(entry[1] for entry in statistics)
+        if statement is None:
+            return statistics[0][0], staleness
+        if not self.plan_estimates:
+            return None, staleness
+        plan = conn.execute(Explain(statement, 'FORMAT JSON')).scalar()[0]
+        return plan['Plan']['Plan Rows'], staleness
+
+    def count(self, target):
+        """Count a table (name or Table) or a Select/ORM Query and return a CountResult"""
+        if isinstance(target, Query):
+            target = target.statement
+        if isinstance(target, str) or not hasattr(target, 'get_final_froms'):
+            table_names = [target if isinstance(target, str) else target.fullname]
+            statement = None
+        else:
+            table_names = sorted({found.fullname for found in find_tables(target, include_crud=False)})
+            statement = target
+
+        with self.engine.connect() as conn:
+            estimate = self.estimate(conn, statement, table_names)
+            if self.refresh_stats and (estimate is None or estimate[1] > self.max_error):
+                self.refresh_in_background(table_names)
+            rows, staleness = estimate or (None, None)
+            if rows is not None and rows >= self.exact_threshold:
+                if statement is not None:
+                    return CountResult(int(rows), False, None)
+                if staleness <= self.max_error:
+                    return CountResult(int(rows), False, staleness)
+
+            return CountResult(self.exact_count(conn, statement, table_names[0]), True, 0.0)